@@ -0,0 +1 @@
+# Lets pytest import traffic.py from the repository root
@@ -0,0 +1,270 @@
+import json
+from unittest import mock
+
+import numpy as np
+import pytest
+import requests
+
+import traffic
+
+
+def make_response(status_code, body=None, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = json.dumps(body).encode() if body is not None else b''
+    response.headers.update(headers or {})
+    return response
+
+
+def make_session(*responses):
+    session = mock.Mock()
+    session.get.side_effect = list(responses)
+    return session
+
+
+@pytest.fixture(autouse=True)
+def fresh_rate_gate(monkeypatch):
+    monkeypatch.setattr(traffic, 'rate_gate', traffic.RateGate())
+    monkeypatch.setattr(traffic.time, 'sleep', mock.Mock())
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = traffic.ResponseCache(filename=str(tmp_path / 'cache'))
+    yield cache
+    cache.close()
+
+
+def test_api_get_returns_success():
+    session = make_session(make_response(200, {'count': 1}))
+    response = traffic.api_get(session, 'https://api.github.com/x')
+    assert response.status_code == 200
+    session.get.assert_called_once_with('https://api.github.com/x', headers=None, timeout=10)
+
+
+def test_api_get_returns_not_modified():
+    session = make_session(make_response(304))
+    assert traffic.api_get(session, 'https://api.github.com/x').status_code == 304
+    assert session.get.call_count == 1
+
+
+def test_api_get_retries_rate_limited_403():
+    session = make_session(
+        make_response(403, headers={'X-RateLimit-Remaining': '0', 'X-RateLimit-Reset': '0'}),
+        make_response(200, {'count': 1})
+    )
+    assert traffic.api_get(session, 'https://api.github.com/x').status_code == 200
+    assert session.get.call_count == 2
+
+
+def test_api_get_returns_permission_403():
+    session = make_session(make_response(403, {'message': 'Must have push access'}))
+    assert traffic.api_get(session, 'https://api.github.com/x').status_code == 403
+    assert session.get.call_count == 1
+
+
+def test_api_get_backs_off_429_then_gives_up():
+    responses = [make_response(429, headers={'Retry-After': '1'}) for _ in range(len(traffic.BACKOFF_DELAYS) + 1)]
+    session = make_session(*responses)
+    assert traffic.api_get(session, 'https://api.github.com/x').status_code == 429
+    assert session.get.call_count == len(traffic.BACKOFF_DELAYS) + 1
+    traffic.time.sleep.assert_any_call(1.0)
+
+
+def test_cached_get_stores_and_revalidates(cache):
+    url = 'https://api.github.com/repos/u/r/traffic/views'
+    session = make_session(
+        make_response(200, {'count': 5}, {'ETag': '"abc"'}),
+        make_response(304)
+    )
+    assert traffic.cached_get(session, cache, url) == (200, {'count': 5})
+    assert traffic.cached_get(session, cache, url) == (200, {'count': 5})
+    assert session.get.call_args.kwargs['headers'] == {'If-None-Match': '"abc"'}
+    assert cache.not_modified == 1
+
+
+def test_cached_get_reports_errors(cache):
+    session = make_session(make_response(403, {'message': 'Must have push access'}))
+    assert traffic.cached_get(session, cache, 'https://api.github.com/x') == (403, None)
+
+
+def test_cached_get_retries_429(cache):
+    session = make_session(
+        make_response(429, headers={'Retry-After': '2'}),
+        make_response(200, {'count': 3}, {'ETag': '"def"'})
+    )
+    assert traffic.cached_get(session, cache, 'https://api.github.com/x') == (200, {'count': 3})
+    assert session.get.call_count == 2
+
+
+
+def test_rate_gate_keeps_lowest_remaining_in_window():
+    gate = traffic.RateGate()
+    gate.update({'X-RateLimit-Remaining': '40', 'X-RateLimit-Reset': '1000'})
+    gate.update({'X-RateLimit-Remaining': '42', 'X-RateLimit-Reset': '1000'})
+    assert gate.remaining == 40
+    gate.update({'X-RateLimit-Remaining': '4999', 'X-RateLimit-Reset': '4600'})
+    assert (gate.remaining, gate.reset_at) == (4999, 4600)
+    gate.update({'X-RateLimit-Remaining': '10', 'X-RateLimit-Reset': '1000'})
+    assert (gate.remaining, gate.reset_at) == (4999, 4600)
+
+
+def test_rate_limit_is_saved_per_token(cache):
+    cache.put_rate_limit('token-a', 12, 1000)
+    assert cache.get_rate_limit('token-a') == (12, 1000)
+    assert cache.get_rate_limit('token-b') is None
+
+
+def test_get_repo_traffic_closes_cache_when_listing_fails(monkeypatch):
+    cache = mock.Mock()
+    monkeypatch.setattr(traffic, 'ResponseCache', mock.Mock(return_value=cache))
+    monkeypatch.setattr(traffic, 'fetch_repos', mock.Mock(side_effect=SystemExit(1)))
+    with pytest.raises(SystemExit):
+        traffic.get_repo_traffic('user', 'bad-token')
+    cache.close.assert_called_once()
+
+
+def test_session_leaves_rate_limits_to_api_get():
+    retries = traffic.SESSION.get_adapter('https://api.github.com').max_retries
+    assert 429 not in retries.status_forcelist
+
+
+def test_cached_get_reports_failed_request(cache):
+    session = make_session(requests.Timeout())
+    assert traffic.cached_get(session, cache, 'https://api.github.com/x') == (None, None)
+
+
+def test_cached_get_reports_malformed_body(cache):
+    response = make_response(200, headers={'ETag': '"abc"'})
+    response._content = b'{"count": 1'
+    session = make_session(response)
+    assert traffic.cached_get(session, cache, 'https://api.github.com/x') == (200, None)
+    assert cache.get('https://api.github.com/x') is None
+
+
+def test_fetch_repo_traffic_survives_malformed_body(cache):
+    views = make_response(200)
+    views._content = b'<html>'
+    session = make_session(views, make_response(200, {'count': 3, 'uniques': 1}))
+    repo = {'name': 'r', 'stargazers_count': 2, 'forks_count': 1}
+    row, views_status_code = traffic.fetch_repo_traffic(session, cache, repo, 'u', mock.Mock())
+    assert row == ('r', 0, 0, 3, 1, 2, 1, None)
+    assert views_status_code == 200
+
+
+def test_cached_get_counts_reuse_separately(tmp_path):
+    cache = traffic.ResponseCache(filename=str(tmp_path / 'cache'), use_cache=True)
+    url = 'https://api.github.com/repos/u/r/traffic/clones'
+    cache.put(url, '"abc"', {'count': 2})
+    session = make_session()
+    assert traffic.cached_get(session, cache, url) == (200, {'count': 2})
+    assert (cache.reused, cache.not_modified) == (1, 0)
+    session.get.assert_not_called()
+    cache.close()
+
+
+def make_listing(names, cursor=None):
+    return make_response(200, {'data': {'user': {'repositories': {
+        'pageInfo': {'endCursor': cursor, 'hasNextPage': cursor is not None},
+        'nodes': [{'name': name, 'stargazerCount': 1, 'forkCount': 0} for name in names]
+    }}}})
+
+
+def test_fetch_repos_follows_cursor(cache):
+    session = mock.Mock()
+    session.post.side_effect = [make_listing(['a', 'b'], cursor='c1'), make_listing(['c'])]
+    repos = traffic.fetch_repos(session, cache, 'u')
+    assert [repo['name'] for repo in repos] == ['a', 'b', 'c']
+    assert repos[0] == {'name': 'a', 'stargazers_count': 1, 'forks_count': 0}
+    cursors = [call.kwargs['json']['variables']['cursor'] for call in session.post.call_args_list]
+    assert cursors == [None, 'c1']
+
+
+def test_fetch_repos_exits_on_bad_token(cache, capsys):
+    session = mock.Mock(**{'post.return_value': make_response(401)})
+    with pytest.raises(SystemExit):
+        traffic.fetch_repos(session, cache, 'u')
+    assert 'Authentication failed' in capsys.readouterr().out
+
+
+def test_fetch_repos_exits_on_graphql_errors(cache, capsys):
+    body = {'data': {'user': None}, 'errors': [{'message': "Could not resolve to a User with the login of 'u'."}]}
+    session = mock.Mock(**{'post.return_value': make_response(200, body)})
+    with pytest.raises(SystemExit):
+        traffic.fetch_repos(session, cache, 'u')
+    assert 'Could not resolve to a User' in capsys.readouterr().out
+
+
+def test_fetch_repos_exits_on_request_failure(cache, capsys):
+    session = mock.Mock(**{'post.side_effect': requests.ConnectionError('connection reset')})
+    with pytest.raises(SystemExit):
+        traffic.fetch_repos(session, cache, 'u')
+    assert 'connection reset' in capsys.readouterr().out
+
+
+def test_session_retries_graphql_post():
+    retries = traffic.SESSION.get_adapter('https://api.github.com').max_retries
+    assert retries.is_retry('POST', 502)
+
+
+def test_progress_printer_final_repaint_shows_total(capsys):
+    progress = traffic.ProgressPrinter(3, interval=60)
+    progress.start()
+    progress.report('b | Views: 1/1')
+    progress.report('a | Views: 2/1')
+    progress.stop()
+    assert capsys.readouterr().out.endswith('\r[3/3] a | Views: 2/1\033[K')
+
+
+def make_traffic(rows):
+    """Column dict as returned by get_repo_traffic, from (name, views_total, ..., forks, date_range) rows"""
+    names, *metrics, date_ranges = zip(*rows)
+    metrics = np.array(metrics, dtype=np.int64)
+    return {
+        'repository': np.array(names, dtype=object),
+        **dict(zip(traffic.METRIC_WEIGHTS, metrics)),
+        'date_range': np.array(date_ranges, dtype=object),
+        'combined_metrics': np.fromiter(traffic.METRIC_WEIGHTS.values(), dtype=np.float64) @ metrics
+    }
+
+
+TRAFFIC_ROWS = [
+    ('quiet', 0, 0, 0, 0, 0, 0, None),
+    ('starred', 0, 0, 0, 0, 4, 0, None),
+    ('busy', 9, 3, 2, 1, 1, 0, '2026-10-01 to 2026-10-14'),
+    ('tied', 9, 2, 0, 0, 0, 1, '2026-10-01 to 2026-10-14'),
+]
+
+
+def test_sort_and_filter_orders_descending_and_stable():
+    result = traffic.sort_and_filter(make_traffic(TRAFFIC_ROWS), 'views_total')
+    assert list(result['repository']) == ['busy', 'tied', 'quiet', 'starred']
+    assert list(result['views_unique']) == [3, 2, 0, 0]
+
+
+def test_sort_and_filter_applies_masks():
+    data = make_traffic(TRAFFIC_ROWS)
+    hidden_empty = traffic.sort_and_filter(data, 'combined_metrics', hide_empty=True)
+    assert list(hidden_empty['repository']) == ['busy', 'tied', 'starred']
+    with_views = traffic.sort_and_filter(data, 'stars', hide_empty=True, no_zero_views=True)
+    assert list(with_views['repository']) == ['busy', 'tied']
+
+
+def test_write_csv_output(tmp_path):
+    filename = tmp_path / 'traffic.csv'
+    traffic.write_csv(filename, make_traffic([TRAFFIC_ROWS[2], TRAFFIC_ROWS[1]]))
+    assert filename.read_bytes().decode() == (
+        'repository,views_total,views_unique,clones_total,clones_unique,stars,forks,date_range\r\n'
+        'busy,9,3,2,1,1,0,2026-10-01 to 2026-10-14\r\n'
+        'starred,0,0,0,0,4,0,\r\n'
+    )
+
+
+def test_format_table_right_aligns_columns():
+    lines = traffic.format_table(make_traffic([TRAFFIC_ROWS[2], TRAFFIC_ROWS[1]]))
+    assert [traffic.re.sub(r'\033\[[0-9;]*m', '', line) for line in lines] == [
+        '# repository views_total views_unique clones_total clones_unique stars forks',
+        '1       busy           9            3            2             1     1     0',
+        '2    starred           0            0            0             0     4     0',
+    ]
+    assert f'{traffic.Colors.BLUE}views_total{traffic.Colors.RESET}' in lines[0]
@@ -8,16 +8,32 @@ token = REDDIT_APP_SECRET_TOKEN
 """
 
 import requests
-import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import configparser
+import csv
+import hashlib
 import os
+import re
+import sys
 import argparse
+import itertools
 import threading
-import queue
+import shelve
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
+# orjson parses API responses several times faster when it is installed
+try:
+    import orjson
+    def parse_json(response):
+        return orjson.loads(response.content)
+except ImportError:
+    def parse_json(response):
+        return response.json()
+
 # ANSI escape codes for terminal colors with better contrast
 class Colors:
     # High contrast colors for better visibility
@@ -31,32 +47,307 @@ class Colors:
     GRAY = '\033[0;37m'   # Gray text
     RESET = '\033[0m'     # Reset to default
 
-def fetch_repo_traffic(repo, i, total_repos, username, token, result_queue, timeframe=None):
+# Create a lock for thread-safe printing
+print_lock = threading.Lock()
+
+# Numeric columns gathered for every repository, with their weight in
+# combined_metrics. Stars and forks are weighted lower than views/clones
+# to prioritize actual traffic
+METRIC_WEIGHTS = {
+    'views_total': 1.0,
+    'views_unique': 1.5,
+    'clones_total': 2.0,
+    'clones_unique': 3.0,
+    'stars': 0.5,
+    'forks': 1.0
+}
+
+# Requests are I/O bound, so run more workers than cores; the connection
+# pool is sized to match so no worker waits on a socket
+MAX_WORKERS = 20
+
+# One session shared by all worker threads. urllib3's connection pool is
+# thread-safe, so every request reuses the same keep-alive TLS connections
+SESSION = requests.Session()
+SESSION.headers['Accept'] = 'application/vnd.github.v3+json'
+# Only server errors are retried here; api_get owns rate limit (429/403) backoff.
+# POST is retried too because the only POST is the read-only GraphQL listing
+SESSION.mount('https://', HTTPAdapter(
+    pool_connections=MAX_WORKERS,
+    pool_maxsize=MAX_WORKERS,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504],
+                      allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {'POST'})
+))
+
+# Pause once fewer than this many core API requests remain in the window
+RATE_LIMIT_THRESHOLD = 50
+# Delays in seconds between retries of a secondary rate limited request
+BACKOFF_DELAYS = (0.5, 1, 2, 4)
+
+class RateGate:
+    """Tracks GitHub's X-RateLimit headers and waits for the reset when the budget runs low"""
+    def __init__(self, threshold=RATE_LIMIT_THRESHOLD):
+        self.threshold = threshold
+        self.remaining = None
+        self.reset_at = 0
+        self._lock = threading.Lock()
+    
+    def update(self, headers):
+        # GraphQL reports its own budget with the same headers, only track core
+        if headers.get('X-RateLimit-Resource', 'core') != 'core':
+            return
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset_at = headers.get('X-RateLimit-Reset')
+        if remaining is None or reset_at is None:
+            return
+        remaining, reset_at = int(remaining), int(reset_at)
+        with self._lock:
+            # Workers finish out of order, so keep the lowest count seen in
+            # the current window and ignore responses from an older one
+            if self.remaining is not None and reset_at == self.reset_at:
+                self.remaining = min(self.remaining, remaining)
+            elif self.remaining is None or reset_at > self.reset_at:
+                self.remaining = remaining
+                self.reset_at = reset_at
+    
+    def restore(self, remaining, reset_at):
+        """Start from a budget observed earlier, until a response reports a fresh one"""
+        with self._lock:
+            if self.remaining is None:
+                self.remaining = remaining
+                self.reset_at = reset_at
+    
+    def wait_if_needed(self):
+        with self._lock:
+            if self.remaining is None or self.remaining >= self.threshold:
+                return
+            delay = self.reset_at - time.time()
+        if delay > 0:
+            with print_lock:
+                print(f"\nRate limit nearly exhausted ({self.remaining} left), waiting {delay:.0f}s for reset...")
+            time.sleep(delay)
+
+# Shared by all worker threads
+rate_gate = RateGate()
+
+def is_rate_limited(response):
+    """True for 429s and for 403s caused by a primary or secondary rate limit"""
+    if response.status_code == 429:
+        return True
+    return response.status_code == 403 and (
+        'Retry-After' in response.headers or response.headers.get('X-RateLimit-Remaining') == '0'
+    )
+
+def api_get(session, url, headers=None):
+    """GET a GitHub API URL, pacing against the rate limit and backing off when throttled"""
+    for delay in BACKOFF_DELAYS + (None,):
+        rate_gate.wait_if_needed()
+        response = session.get(url, headers=headers, timeout=10)
+        rate_gate.update(response.headers)
+        if delay is None or not is_rate_limited(response):
+            return response
+        time.sleep(max(delay, float(response.headers.get('Retry-After', 0))))
+
+# On-disk cache of API responses, keyed by URL
+CACHE_FILE = '.gh_traffic_cache'
+CACHE_TTL = 3600  # Seconds a cached response is reused without asking GitHub (--use-cache)
+RATE_LIMIT_KEY = 'rate_limit'  # Cache entry prefix for the last observed core rate limit, per token
+
+def rate_limit_key(token):
+    """Cache key for a token's rate limit, without storing the token itself"""
+    return f"{RATE_LIMIT_KEY}/{hashlib.sha256(token.encode()).hexdigest()}"
+
+class ResponseCache:
+    """Thread-safe shelve of {'etag', 'body', 'ts'} entries keyed by URL, plus the last seen rate limit"""
+    def __init__(self, filename=CACHE_FILE, use_cache=False):
+        self.use_cache = use_cache
+        self.not_modified = 0  # Core API requests GitHub answered with a 304
+        self.reused = 0        # Core API requests skipped entirely under --use-cache
+        self._lock = threading.Lock()
+        self._db = shelve.open(filename)
+    
+    def get(self, url):
+        with self._lock:
+            return self._db.get(url)
+    
+    def put(self, url, etag, body):
+        with self._lock:
+            self._db[url] = {'etag': etag, 'body': body, 'ts': time.time()}
+    
+    def record_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+    
+    def record_reused(self):
+        with self._lock:
+            self.reused += 1
+    
+    def get_rate_limit(self, token):
+        """Return (remaining, reset_at) saved by a previous run with this token, or None"""
+        with self._lock:
+            return self._db.get(rate_limit_key(token))
+    
+    def put_rate_limit(self, token, remaining, reset_at):
+        with self._lock:
+            self._db[rate_limit_key(token)] = (remaining, reset_at)
+    
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+def cached_get(session, cache, url):
+    """GET a JSON endpoint, revalidating any cached copy with its ETag.
+    
+    Returns (status_code, body). A 304 from GitHub is free and is reported
+    as a 200 carrying the cached body. body is None on any other error,
+    including a 200 whose body is not valid JSON, and status_code is None if
+    the request itself failed (timeout, connection).
+    """
+    entry = cache.get(url)
+    
+    # Skip the request entirely if the user opted in and the entry is fresh
+    if entry and cache.use_cache and time.time() - entry['ts'] < CACHE_TTL:
+        cache.record_reused()
+        return 200, entry['body']
+    
+    headers = {}
+    if entry and entry['etag']:
+        headers['If-None-Match'] = entry['etag']
+    
+    try:
+        response = api_get(session, url, headers)
+    except requests.RequestException:
+        return None, None
+    
+    if response.status_code == 304 and entry:
+        cache.record_not_modified()
+        cache.put(url, entry['etag'], entry['body'])
+        return 200, entry['body']
+    if response.status_code != 200:
+        return response.status_code, None
+    
+    try:
+        body = parse_json(response)
+    except ValueError:
+        return response.status_code, None
+    
+    cache.put(url, response.headers.get('ETag'), body)
+    return 200, body
+
+# GraphQL returns just the repository fields we use, 100 per page
+GRAPHQL_URL = 'https://api.github.com/graphql'
+REPOS_QUERY = '''
+query($login: String!, $cursor: String) {
+  user(login: $login) {
+    repositories(first: 100, after: $cursor, ownerAffiliations: OWNER, privacy: PUBLIC) {
+      pageInfo { endCursor hasNextPage }
+      nodes { name stargazerCount forkCount }
+    }
+  }
+}
+'''
+
+def fetch_repos(session, cache, username):
+    """List the user's public repositories with their star and fork counts"""
+    # GraphQL POSTs carry no ETag, so the listing is only reused under --use-cache
+    cache_key = f'{GRAPHQL_URL}#repositories/{username}'
+    entry = cache.get(cache_key)
+    if entry and cache.use_cache and time.time() - entry['ts'] < CACHE_TTL:
+        return entry['body']
+    
+    repos = []
+    cursor = None
+    while True:
+        payload = {'query': REPOS_QUERY, 'variables': {'login': username, 'cursor': cursor}}
+        try:
+            response = session.post(GRAPHQL_URL, json=payload, timeout=10)
+        except requests.RequestException as error:
+            print(f"Error: Could not list repositories for {username}: {error}")
+            exit(1)
+        
+        # The listing doubles as the token check, a bad token gets a 401 here
+        if response.status_code == 401:
+            print(f"Error: Authentication failed. Status code: {response.status_code}")
+            print("Please check that your token is valid.")
+            exit(1)
+        
+        try:
+            data = parse_json(response) if response.status_code == 200 else {}
+        except ValueError:
+            data = {}
+        
+        if not data.get('data') or not data['data']['user']:
+            errors = '; '.join(e['message'] for e in data.get('errors', []))
+            print(f"Error: Could not list repositories for {username}. Status code: {response.status_code}")
+            if errors:
+                print(errors)
+            exit(1)
+        
+        # Keep the REST field names the rest of the script expects
+        page = data['data']['user']['repositories']
+        repos.extend({
+            'name': node['name'],
+            'stargazers_count': node['stargazerCount'],
+            'forks_count': node['forkCount']
+        } for node in page['nodes'])
+        
+        if not page['pageInfo']['hasNextPage']:
+            cache.put(cache_key, None, repos)
+            return repos
+        cursor = page['pageInfo']['endCursor']
+
+class ProgressPrinter:
+    """Repaints a single progress line from a background thread at a fixed rate"""
+    def __init__(self, total, interval=0.1):
+        self.total = total
+        self.interval = interval
+        self._counter = itertools.count(1)
+        self._latest = None  # (done, status), replaced in a single assignment
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+    
+    def report(self, status):
+        """Record a finished repository; safe to call from any worker without locking"""
+        self._latest = (next(self._counter), status)
+    
+    def start(self):
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        # Every worker has finished by now, whichever wrote the last status
+        self._render(done=self.total)
+    
+    def _render(self, done=None):
+        latest = self._latest
+        if latest is not None:
+            with print_lock:
+                print(f"\r[{done or latest[0]}/{self.total}] {latest[1]}\033[K", end="", flush=True)
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._render()
+
+def fetch_repo_traffic(session, cache, repo, username, progress, timeframe=None):
     """Fetch traffic data for a single repository"""
     repo_name = repo['name']
     
-    headers = {
-        'Authorization': f'token {token}',
-        'Accept': 'application/vnd.github.v3+json'
-    }
-    
     # GitHub API only provides traffic data for the last 14 days
     views_url = f'https://api.github.com/repos/{username}/{repo_name}/traffic/views'
     clones_url = f'https://api.github.com/repos/{username}/{repo_name}/traffic/clones'
     
-    views_response = requests.get(views_url, headers=headers)
-    clones_response = requests.get(clones_url, headers=headers)
+    views_status_code, views = cached_get(session, cache, views_url)
+    clones_status_code, clones = cached_get(session, cache, clones_url)
     
-    # Get data from responses, silently handle errors
-    if views_response.status_code != 200:
+    # Get data from responses, silently handle errors (no body means it failed)
+    views_ok = views is not None
+    clones_ok = clones is not None
+    if not views_ok:
         views = {"count": 0, "uniques": 0}
-    else:
-        views = views_response.json()
         
-    if clones_response.status_code != 200:
+    if not clones_ok:
         clones = {"count": 0, "uniques": 0}
-    else:
-        clones = clones_response.json()
     
     # Extract traffic stats
     views_total = views.get('count', 0)
@@ -66,114 +357,186 @@ def fetch_repo_traffic(repo, i, total_repos, username, token, result_queue, time
     stars = repo['stargazers_count']
     forks = repo['forks_count']
     
-    # Get date range information
+    # Get date range information (views arrive sorted, ISO timestamps start with the date)
     views_timerange = None
-    if 'views' in views and views['views']:
-        first_date = views['views'][0]['timestamp'].split('T')[0]
-        last_date = views['views'][-1]['timestamp'].split('T')[0]
+    if views.get('views'):
+        first_date = views['views'][0]['timestamp'][:10]
+        last_date = views['views'][-1]['timestamp'][:10]
         views_timerange = f"{first_date} to {last_date}"
     
     # Status indicators
-    views_status = "✅" if views_response.status_code == 200 else "❌"
-    clones_status = "✅" if clones_response.status_code == 200 else "❌"
-    
-    # Print progress with thread-safe approach
-    with print_lock:
-        print(f"\r[{i}/{total_repos}] {repo_name} | Views: {views_total}/{views_unique} {views_status} | Clones: {clones_total}/{clones_unique} {clones_status} | Stars: {stars} | Forks: {forks}\033[K", end="")
-    
-    # Add result to queue
-    result_queue.put({
-        'repository': repo_name,
-        'views_total': views_total,
-        'views_unique': views_unique,
-        'clones_total': clones_total,
-        'clones_unique': clones_unique,
-        'stars': stars,
-        'forks': forks,
-        'date_range': views_timerange
-    })
-
-# Create a lock for thread-safe printing
-print_lock = threading.Lock()
+    views_status = "✅" if views_ok else "❌"
+    clones_status = "✅" if clones_ok else "❌"
+    
+    # Hand the status line to the progress printer thread
+    progress.report(f"{repo_name} | Views: {views_total}/{views_unique} {views_status} | Clones: {clones_total}/{clones_unique} {clones_status} | Stars: {stars} | Forks: {forks}")
+    
+    # Return result row, metrics in METRIC_WEIGHTS order, and the views status
+    # so the caller can spot missing traffic permissions
+    row = (repo_name, views_total, views_unique, clones_total, clones_unique,
+           stars, forks, views_timerange)
+    return row, views_status_code
 
-def get_repo_traffic(username, token, timeframe=None):
+def get_repo_traffic(username, token, timeframe=None, use_cache=False, skip_inactive=False):
     print(f"Starting GitHub traffic analysis for user: {username}")
     if timeframe:
         print(f"Using timeframe of {timeframe} days")
     
-    # Get all repositories for the user
-    headers = {
-        'Authorization': f'token {token}',
-        'Accept': 'application/vnd.github.v3+json'
-    }
-    
-    # Check token validity and permissions
-    rate_limit_url = 'https://api.github.com/rate_limit'
-    rate_response = requests.get(rate_limit_url, headers=headers)
+    # Authenticate the shared session for this user
+    session = SESSION
+    session.headers['Authorization'] = f'token {token}'
     
-    if rate_response.status_code != 200:
-        print(f"Error: Authentication failed. Status code: {rate_response.status_code}")
-        print("Please check that your token is valid.")
-        exit(1)
+    # Revalidate responses from earlier runs instead of refetching them
+    cache = ResponseCache(use_cache=use_cache)
     
-    # Get repositories
-    repos_url = f'https://api.github.com/users/{username}/repos?per_page=1000'
-    response = requests.get(repos_url, headers=headers)
-    repos = response.json()
+    # Get repositories (also validates the token); fetch_repos exits on
+    # failure, so close the cache first
+    try:
+        repos = fetch_repos(session, cache, username)
+    except BaseException:
+        cache.close()
+        raise
     
     print(f"Found {len(repos)} repositories to examine")
     
-    # Issue warning about permissions if needed
-    test_repo = repos[0]['name'] if repos else None
-    if test_repo:
-        test_url = f'https://api.github.com/repos/{username}/{test_repo}/traffic/views'
-        test_response = requests.get(test_url, headers=headers)
-        if test_response.status_code == 403:
-            print("\nWARNING: Your token doesn't have permission to access traffic data.")
-            print("The script will continue but will only show stars and forks.")
-            print("To access traffic data, generate a new token with the 'repo' scope.")
-            print("See: https://docs.github.com/en/authentication/keeping-your-account-and-data-secure/creating-a-personal-access-token\n")
-    
-    # Create a queue for results
-    result_queue = queue.Queue()
-    
-    # Process repositories in batches of 10 with ThreadPoolExecutor
-    BATCH_SIZE = 10
-    total_repos = len(repos)
-    
-    with ThreadPoolExecutor(max_workers=BATCH_SIZE) as executor:
-        # Submit tasks for each repository
-        futures = []
-        for i, repo in enumerate(repos, 1):
-            future = executor.submit(
-                fetch_repo_traffic,
-                repo, i, total_repos, username, token, result_queue, timeframe
-            )
-            futures.append(future)
-    
-    # Wait for all tasks to complete
-    print("\nProcessing complete. Collecting results...")
-    
-    # Collect all results from the queue
-    traffic_data = []
-    while not result_queue.empty():
-        traffic_data.append(result_queue.get())
-    
-    # Convert to DataFrame
-    df = pd.DataFrame(traffic_data)
-    
-    # Add a combined_metrics column with weighted values for sorting
-    # We'll weight stars and forks lower than views/clones to prioritize actual traffic
-    df['combined_metrics'] = (
-        (df['views_total'] * 1.0) + 
-        (df['views_unique'] * 1.5) + 
-        (df['clones_total'] * 2.0) + 
-        (df['clones_unique'] * 3.0) + 
-        (df['stars'] * 0.5) + 
-        (df['forks'] * 1.0)
-    )
+    # Repos without stars or forks rarely have traffic; skip their API calls when
+    # the caller is going to hide empty rows anyway
+    if skip_inactive:
+        active = [repo for repo in repos if repo['stargazers_count'] or repo['forks_count']]
+        print(f"Skipping {len(repos) - len(active)} repositories with no stars or forks")
+        repos = active
+    
+    # Pick up the rate limit budget left by a previous run with this token in the same window
+    saved_rate_limit = cache.get_rate_limit(token)
+    if saved_rate_limit and saved_rate_limit[1] > time.time():
+        remaining, reset_at = saved_rate_limit
+        rate_gate.restore(remaining, reset_at)
+        if remaining < 2 * len(repos) + 10:
+            reset_time = datetime.fromtimestamp(reset_at).strftime('%H:%M:%S')
+            print(f"Note: only {remaining} API requests left until {reset_time}; the run may pause for the rate limit reset")
+    
+    progress = ProgressPrinter(len(repos))
+    progress.start()
+    
+    # Always stop the progress thread and flush the cache, even if a worker fails
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            # Submit tasks for each repository
+            futures = []
+            for repo in repos:
+                future = executor.submit(
+                    fetch_repo_traffic,
+                    session, cache, repo, username, progress, timeframe
+                )
+                futures.append(future)
+            
+            # Collect each result as its task completes
+            traffic_data = []
+            for future in as_completed(futures):
+                row, views_status_code = future.result()
+                
+                # Issue warning about permissions if the first repository was refused
+                if views_status_code == 403 and not traffic_data:
+                    with print_lock:
+                        print("\nWARNING: Your token doesn't have permission to access traffic data.")
+                        print("The script will continue but will only show stars and forks.")
+                        print("To access traffic data, generate a new token with the 'repo' scope.")
+                        print("See: https://docs.github.com/en/authentication/keeping-your-account-and-data-secure/creating-a-personal-access-token\n")
+                
+                traffic_data.append(row)
+    finally:
+        progress.stop()
+        
+        # Save the observed budget so the next run knows it without asking
+        if rate_gate.remaining is not None:
+            cache.put_rate_limit(token, rate_gate.remaining, rate_gate.reset_at)
+        cache.close()
+    
+    print("\nProcessing complete.")
+    
+    # Report ETag revalidations and -u reuse of core traffic requests separately
+    if cache.not_modified:
+        print(f"ETag cache: {cache.not_modified} traffic requests answered 304 Not Modified")
+    if cache.reused:
+        print(f"Response cache (-u): {cache.reused} traffic requests skipped")
+    
+    # Transpose rows into one array per column
+    names, *metrics, date_ranges = list(zip(*traffic_data)) or [()] * (len(METRIC_WEIGHTS) + 2)
+    metrics = np.array(metrics, dtype=np.int64).reshape(len(METRIC_WEIGHTS), -1)
+    
+    # Weighted sum of all metrics in a single matrix product, used for sorting
+    weights = np.fromiter(METRIC_WEIGHTS.values(), dtype=np.float64)
+    combined_metrics = weights @ metrics
+    
+    # Return one array per column; sorting and filtering stay in NumPy
+    return {
+        'repository': np.array(names, dtype=object),
+        **dict(zip(METRIC_WEIGHTS, metrics)),
+        'date_range': np.array(date_ranges, dtype=object),
+        'combined_metrics': combined_metrics
+    }
+
+# Column header colors for the summary table
+HEADER_COLORS = {
+    '#': Colors.WHITE,
+    'repository': Colors.GREEN,
+    'views_total': Colors.BLUE, 
+    'views_unique': Colors.CYAN,
+    'clones_total': Colors.YELLOW,
+    'clones_unique': Colors.MAGENTA,
+    'stars': Colors.RED,
+    'forks': Colors.GRAY
+}
+
+# Match whole column names only, so 'views_total' is never recolored as a substring
+HEADER_PATTERN = re.compile(r'(?<!\S)(' + '|'.join(re.escape(col) for col in HEADER_COLORS) + r')(?!\S)')
+
+def sort_and_filter(traffic, sort_by, hide_empty=False, no_zero_views=False):
+    """Return the traffic columns sorted descending by sort_by, with filtered rows removed"""
+    # Stable, so repositories with equal metrics keep their original order
+    order = np.argsort(-traffic[sort_by], kind='stable')
+    
+    # Filter out repos with all zeros if requested
+    keep = np.ones(len(order), dtype=bool)
+    if hide_empty:
+        keep &= traffic['combined_metrics'] > 0
     
-    return df
+    # Filter out repos with zero views if requested
+    if no_zero_views:
+        keep &= traffic['views_total'] > 0
+    
+    # Reorder every column once
+    order = order[keep[order]]
+    return {col: values[order] for col, values in traffic.items()}
+
+def write_csv(filename, traffic):
+    """Save all data including date range, streamed straight from the column arrays"""
+    # Just leave out combined_metrics which is internal
+    csv_cols = ['repository', *METRIC_WEIGHTS, 'date_range']
+    with open(filename, 'w', newline='') as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(csv_cols)
+        writer.writerows(zip(*(traffic[col] for col in csv_cols)))
+
+def format_table(traffic):
+    """Return the numbered summary table lines with a colored header"""
+    # Select only the displayed columns; date_range is already shown in the header
+    # and combined_metrics is internal
+    display_cols = ['repository', *METRIC_WEIGHTS]
+    
+    # Add position column starting at 1 in all cases
+    header = ['#', *display_cols]
+    columns = [range(1, len(traffic['repository']) + 1), *(traffic[col] for col in display_cols)]
+    
+    # Right-align every cell to its column's widest value, like a plain table
+    rows = [header] + [[str(value) for value in row] for row in zip(*columns)]
+    widths = [max(len(cell) for cell in column) for column in zip(*rows)]
+    row_format = ' '.join(f'{{:>{width}}}' for width in widths)
+    lines = [row_format.format(*row) for row in rows]
+    
+    # Color each column name in a single pass over the header
+    lines[0] = HEADER_PATTERN.sub(lambda m: f"{HEADER_COLORS[m.group(1)]}{m.group(1)}{Colors.RESET}", lines[0])
+    return lines
 
 # Read credentials from ini file
 def read_credentials():
@@ -199,6 +562,8 @@ Examples:
   python traffic.py -s views_total        # Sort by total views
   python traffic.py -z -s clones_unique   # Show only repos with views, sorted by unique clones
   python traffic.py -t 14                 # Get data for the last 14 days (GitHub API maximum)
+  python traffic.py -u                    # Reuse traffic data fetched within the last hour
+  python traffic.py -e -f                 # Hide empty repos without querying repos that have no stars or forks
         ''',
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
@@ -214,6 +579,10 @@ Examples:
                       help='Sort results by a specific metric (default: combined_metrics)')
     parser.add_argument('-t', '--timeframe', type=int, default=14,
                       help='Set the timeframe for reports in days (default: 14, GitHub API maximum)')
+    parser.add_argument('-u', '--use-cache', action='store_true',
+                      help='Reuse cached repository and traffic data less than an hour old without contacting GitHub')
+    parser.add_argument('-f', '--fast-filter', action='store_true',
+                      help='With -e or -z, skip traffic requests for repositories with no stars or forks')
     args = parser.parse_args()
     
     username, token = read_credentials()
@@ -224,33 +593,25 @@ Examples:
         print(f"Note: GitHub API only provides traffic data for the last 14 days. Requested {args.timeframe} days, using maximum of 14 days.")
     
     # Get the traffic data
-    traffic_df = get_repo_traffic(username, token, timeframe)
+    skip_inactive = args.fast_filter and (args.hide_empty or args.no_zero_views)
+    traffic = get_repo_traffic(username, token, timeframe, args.use_cache, skip_inactive)
     
     # Sort by the specified column (descending so highest metrics are at top)
-    traffic_df = traffic_df.sort_values(by=args.sort_by, ascending=False)
-    
-    # Filter out repos with all zeros if requested
-    if args.hide_empty:
-        traffic_df = traffic_df[traffic_df['combined_metrics'] > 0]
-    
-    # Filter out repos with zero views if requested
-    if args.no_zero_views:
-        traffic_df = traffic_df[traffic_df['views_total'] > 0]
+    # and drop the rows hidden by -e / -z
+    traffic = sort_and_filter(traffic, args.sort_by, args.hide_empty, args.no_zero_views)
     
     # Save to CSV only if --write-csv option is specified
     csv_filename = None
     if args.write_csv:
         csv_filename = f'github_traffic_{datetime.now().strftime("%Y%m%d")}.csv'
-        # Save all data including date range in CSV 
-        # (just remove combined_metrics column which is internal)
-        traffic_df.drop('combined_metrics', axis=1).to_csv(csv_filename, index=False)
+        write_csv(csv_filename, traffic)
     
     # Print summary table with explanation
     # Get date range for all repositories
-    date_ranges = [r for r in traffic_df['date_range'].dropna().unique() if r]
+    date_range = next((r for r in traffic['date_range'] if r), None)
     date_range_str = ""
-    if date_ranges:
-        date_range_str = f" | Data period: {date_ranges[0]}"
+    if date_range:
+        date_range_str = f" | Data period: {date_range}"
     
     # Add timeframe info to the title
     timeframe_str = ""
@@ -260,61 +621,17 @@ Examples:
     print(f"\n===== REPOSITORY TRAFFIC SUMMARY (Sorted by: {Colors.CYAN}{args.sort_by}{Colors.RESET}){Colors.MAGENTA}{date_range_str}{timeframe_str}{Colors.RESET} =====")
     
     # Check if we have any non-zero traffic data
-    has_traffic_data = (traffic_df['views_total'].sum() > 0 or traffic_df['clones_total'].sum() > 0)
+    has_traffic_data = (traffic['views_total'].sum() > 0 or traffic['clones_total'].sum() > 0)
     
     if not has_traffic_data:
         print("\nNOTE: No view or clone data available. Sorting may be based on stars and forks only.")
         print("To get traffic data, you need a GitHub token with 'repo' scope permissions.\n")
     
-    # Add numbering to repositories in all cases
-    # Drop date_range column from display (it's already shown in the header)
-    columns_to_drop = ['combined_metrics', 'date_range']
-    
-    # Filter if hide-empty is used
-    traffic_df_display = traffic_df.copy()
-    
-    # Print with position numbering when sorting
-    traffic_df_display = traffic_df_display.drop(columns=columns_to_drop, axis=1)
-    
-    # Add position column starting at 1 when sorting by a specific column
-    if args.sort_by:
-        traffic_df_display.insert(0, '#', range(1, len(traffic_df_display) + 1))
-    
-    # Apply colors to column headers
-    color_map = {
-        '#': Colors.WHITE,
-        'repository': Colors.GREEN,
-        'views_total': Colors.BLUE, 
-        'views_unique': Colors.CYAN,
-        'clones_total': Colors.YELLOW,
-        'clones_unique': Colors.MAGENTA,
-        'stars': Colors.RED,
-        'forks': Colors.GRAY
-    }
-    
-    # Format the DataFrame with colored headers
-    pd.set_option('display.max_rows', None)
-    formatted_df = traffic_df_display.copy()
-    
-    # Convert DataFrame to string representation
-    df_string = formatted_df.to_string(index=False)
+    lines = format_table(traffic)
     
-    # Find the header line and color each column name
-    lines = df_string.split('\n')
-    if len(lines) > 0:
-        header = lines[0]
-        colored_header = header
-        
-        # Color each column name
-        for col, color in color_map.items():
-            if col in header:
-                colored_header = colored_header.replace(col, f"{color}{col}{Colors.RESET}")
-        
-        # Replace the header with colored version
-        lines[0] = colored_header
-        
-        # Print the modified string representation
-        print('\n'.join(lines))
+    # Write the whole table at once
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
     
     if csv_filename:
         print(f"\nTraffic data saved to {csv_filename}")